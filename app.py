@@ -3,12 +3,15 @@ import pandas as pd
 import re
 import html
 import os
+import hashlib
+import uuid
 from datetime import datetime, timedelta
 
 from data_collection import MarketIntelligenceCollector
 from nlp_processor import MarketIntelligenceNLP
 from llm_generator import NewsletterGenerator
-from tools import add_content_to_document, send_email
+from tools import build_delivery_handlers
+from delivery_queue import DeliveryQueue, start_worker, COMPLETED, FAILED
 
 # --- App Configuration ---
 st.set_page_config(page_title="Federal R&D Intelligence System", layout="wide")
@@ -35,6 +38,10 @@ def generate_search_query(keywords: list) -> str:
 def normalize_bullet(line):
     return re.sub(r"^\s*[\d]+[\.\)]\s*", "", line).strip()
 
+def render_briefing(briefing: str) -> str:
+    # Briefings may quote scraped article text verbatim, so escape it before embedding in HTML.
+    return f"<p style='background-color:#F0F2F6; color:#31333F; padding:1rem; border-radius:8px;'>{html.escape(briefing)}</p>"
+
 
 # --- Initialization ---
 @st.cache_resource
@@ -44,6 +51,13 @@ def init_components():
     generator = NewsletterGenerator()
     return collector, nlp_processor, generator
 
+@st.cache_resource
+def init_delivery_queue():
+    # One queue and background worker per server process, shared by all sessions.
+    delivery_queue = DeliveryQueue(os.getenv("DELIVERY_QUEUE_DB", "delivery_queue.db"))
+    start_worker(delivery_queue, build_delivery_handlers())
+    return delivery_queue
+
 @st.cache_data
 def load_keywords():
     try:
@@ -53,12 +67,19 @@ def load_keywords():
         return pd.DataFrame({'theme': [], 'keyword': []})
 
 collector, nlp_processor, generator = init_components()
+delivery_queue = init_delivery_queue()
 keywords_df = load_keywords()
 
 if 'report_summaries' not in st.session_state:
     st.session_state.report_summaries = []
 if 'last_report_url' not in st.session_state:
     st.session_state.last_report_url = None
+if 'delivery_jobs' not in st.session_state:
+    st.session_state.delivery_jobs = []
+if 'pending_report_job' not in st.session_state:
+    st.session_state.pending_report_job = None
+if 'pending_report_summaries' not in st.session_state:
+    st.session_state.pending_report_summaries = []
 
 
 # --- UI: Header and Custom CSS ---
@@ -124,28 +145,27 @@ if 'articles_df' in st.session_state and not st.session_state.articles_df.empty:
     report_title = st.text_input("**Enter a title for your final report:**", "Consolidated R&D Intelligence Briefing")
 
     full_df = st.session_state.articles_df
+    # Newest first; themed subsets keep this order, so briefings and source lists follow it too.
+    if 'published_at' in full_df.columns:
+        full_df = full_df.sort_values('published_at', ascending=False, na_position='last', kind='stable')
     themed_articles, themes = nlp_processor.categorize_by_theme(full_df, selected_keywords)
 
     if not themed_articles.empty:
+        # Pass 1: lay out every theme with its instant extractive briefing, so no
+        # expander waits on an earlier theme's LLM call.
+        rendered_themes = []
         for theme_name, theme_details in themes.items():
             articles_in_theme = theme_details['articles']
             if articles_in_theme.empty:
                 continue
 
             with st.expander(f"**{theme_name}** ({len(articles_in_theme)} articles)", expanded=True):
-                with st.spinner(f"Generating intelligence briefing for {theme_name}..."):
-                    intelligence_briefing = generator.generate_newsletter_section(articles_in_theme, theme_details['keywords'])
-                
-                st.markdown(f"<p style='background-color:#F0F2F6; color:#31333F; padding:1rem; border-radius:8px;'>{intelligence_briefing}</p>", unsafe_allow_html=True)
+                briefing_placeholder = st.empty()
+                if generator.client:
+                    briefing_placeholder.markdown(render_briefing(generator.generate_extractive_briefing(articles_in_theme)), unsafe_allow_html=True)
+                status_slot = st.container()
                 
-                if st.button(f"➕ Add '{theme_name}' Summary to Report", key=f"add_{theme_name}"):
-                    if not any(item['theme'] == theme_name for item in st.session_state.report_summaries):
-                        st.session_state.report_summaries.append({
-                            "theme": theme_name,
-                            "content": intelligence_briefing
-                        })
-                        st.toast(f"Added '{theme_name}' summary to the report builder!")
-                        st.rerun()
+                add_clicked = st.button(f"➕ Add '{theme_name}' Summary to Report", key=f"add_{theme_name}")
 
                 st.markdown("---")
                 
@@ -164,30 +184,68 @@ if 'articles_df' in st.session_state and not st.session_state.articles_df.empty:
                     </div>
                     """, unsafe_allow_html=True)
 
+            rendered_themes.append((theme_name, theme_details, briefing_placeholder, status_slot, add_clicked))
+
+        # Pass 2: swap each placeholder over to the LLM briefing as it arrives.
+        for theme_name, theme_details, briefing_placeholder, status_slot, add_clicked in rendered_themes:
+            with status_slot, st.spinner(f"Generating intelligence briefing for {theme_name}..."):
+                intelligence_briefing = generator.generate_newsletter_section(theme_details['articles'], theme_details['keywords'])
+            
+            briefing_placeholder.markdown(render_briefing(intelligence_briefing), unsafe_allow_html=True)
+
+            if add_clicked:
+                if not any(item['theme'] == theme_name for item in st.session_state.report_summaries):
+                    st.session_state.report_summaries.append({
+                        "theme": theme_name,
+                        "content": intelligence_briefing
+                    })
+                    st.toast(f"Added '{theme_name}' summary to the report builder!")
+                    st.rerun()
+
     else:
         st.info("No articles found for the selected criteria. Try broadening your search.")
 else:
     st.info("Select a theme from the sidebar and click 'Search' to begin.")
 
 
-# --- Logic for Buttons (Direct Function Calls) ---
+# --- Logic for Buttons (Queued Delivery) ---
+# Deliveries are handed to the background worker so the UI never blocks on Arcade.
 if generate_button:
-    with st.sidebar:
-        with st.spinner("Consolidating summaries and creating your document..."):
-            final_report_content = ""
-            for item in st.session_state.report_summaries:
-                final_report_content += f"## Intelligence Briefing: {item['theme']}\n\n"
-                final_report_content += f"{item['content']}\n\n---\n\n"
-            
-            response = add_content_to_document(content=final_report_content, file_name=report_title)
-            st.success(response)
-            
-            if "Success!" in response:
-                st.session_state.last_report_content = final_report_content
-                st.session_state.last_report_title = report_title
-                st.session_state.last_report_url = response
-            
-            st.session_state.report_summaries = []
+    final_report_content = ""
+    for item in st.session_state.report_summaries:
+        final_report_content += f"## Intelligence Briefing: {item['theme']}\n\n"
+        final_report_content += f"{item['content']}\n\n---\n\n"
+
+    # Identical reports map to the same job, so double clicks don't create duplicate docs.
+    report_key = hashlib.sha256(f"{report_title}\n{final_report_content}".encode()).hexdigest()
+    job_id = delivery_queue.enqueue(
+        "google_doc", {"content": final_report_content, "file_name": report_title}, idempotency_key=f"doc:{report_key}"
+    )
+    st.session_state.delivery_jobs.append({"label": f"Google Doc '{report_title}'", "job_id": job_id})
+    st.session_state.pending_report_job = job_id
+    # Remember exactly which summaries went into this document, so only those are cleared later.
+    st.session_state.pending_report_summaries = list(st.session_state.report_summaries)
+    st.session_state.last_report_content = final_report_content
+    st.session_state.last_report_title = report_title
+    st.sidebar.info("Report queued for delivery. Track it under Delivery Status.")
+
+if st.session_state.pending_report_job:
+    report_status = delivery_queue.get_status(st.session_state.pending_report_job)
+    if report_status and report_status["status"] == COMPLETED:
+        st.session_state.last_report_url = report_status["result"]
+        st.session_state.last_report_job = st.session_state.pending_report_job
+        # A fresh nonce per completed report lets the same report be emailed again later.
+        st.session_state.email_nonce = uuid.uuid4().hex
+        st.session_state.pending_report_job = None
+        # Summaries are only cleared once the document exists, so a failed job can be regenerated;
+        # themes added after Generate stay in the report builder.
+        st.session_state.report_summaries = [
+            item for item in st.session_state.report_summaries
+            if item not in st.session_state.pending_report_summaries
+        ]
+        st.session_state.pending_report_summaries = []
+    elif report_status and report_status["status"] == FAILED:
+        st.session_state.pending_report_job = None
 
 if st.session_state.last_report_url:
     st.sidebar.markdown("---")
@@ -195,16 +253,41 @@ if st.session_state.last_report_url:
     
     st.sidebar.info("Report created! You can now email it.")
     
-    recipient_email = st.sidebar.text_input("Recipient's Email Address", "mansi.bellani.th@dartmouth.edu")
+    recipient_email = st.sidebar.text_input("Recipient Email Addresses (comma-separated)", "mansi.bellani.th@dartmouth.edu")
     
     if st.sidebar.button("Send Email"):
-        with st.sidebar:
-            with st.spinner("Sending the email..."):
-                email_response = send_email(
-                    content=st.session_state.last_report_content,
-                    subject=st.session_state.last_report_title,
-                    recipient=recipient_email
-                )
-                st.success(email_response)
-                
-                st.session_state.last_report_url = None
\ No newline at end of file
+        # Addresses are case-insensitive, so duplicates differing only in case are dropped.
+        recipients, seen_recipients = [], set()
+        for recipient in (r.strip() for r in recipient_email.split(",")):
+            if recipient and recipient.lower() not in seen_recipients:
+                seen_recipients.add(recipient.lower())
+                recipients.append(recipient)
+        # Scoped to this report's document job and send, so a repeat click within the same
+        # send is deduplicated while a later resend of the same report still goes out.
+        job_ids = delivery_queue.enqueue_emails(
+            content=st.session_state.last_report_content,
+            subject=st.session_state.last_report_title,
+            recipients=recipients,
+            idempotency_key=f"email:{st.session_state.last_report_job}:{st.session_state.email_nonce}"
+        )
+        for recipient, job_id in zip(recipients, job_ids):
+            st.session_state.delivery_jobs.append({"label": f"Email to {recipient}", "job_id": job_id})
+        st.sidebar.info(f"Queued {len(job_ids)} email(s) for delivery.")
+
+        st.session_state.last_report_url = None
+
+if st.session_state.delivery_jobs:
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("📬 Delivery Status")
+    if st.sidebar.button("Refresh Status"):
+        st.rerun()
+    for job in st.session_state.delivery_jobs:
+        job_status = delivery_queue.get_status(job["job_id"])
+        if not job_status:
+            continue
+        if job_status["status"] == COMPLETED:
+            st.sidebar.success(f"{job['label']}: {job_status['result']}")
+        elif job_status["status"] == FAILED:
+            st.sidebar.error(f"{job['label']}: failed after {job_status['attempts']} attempts ({job_status['error']})")
+        else:
+            st.sidebar.write(f"⏳ {job['label']}: {job_status['status']} (attempt {job_status['attempts']})")
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url TEXT PRIMARY KEY,
+    meta_hash TEXT NOT NULL,
+    body_hash TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    record TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+)
+"""
+COLUMNS = {"url", "meta_hash", "body_hash", "fingerprint", "record", "fetched_at"}
+
+# Query parameters that only track the click and never change the article.
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid", "ocid"}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalizes a URL so the same article found via different links maps to one key.
+
+    Lowercases the scheme and host, drops "www.", fragments, tracking parameters
+    (utm_*, fbclid, ...) and trailing slashes, and sorts the remaining query.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/") or "/", urlencode(query), ""))
+
+
+def content_hash(*parts: str) -> str:
+    """Stable hash of one or more text fields, used to detect changed content."""
+    return hashlib.sha256("\x1f".join(p or "" for p in parts).encode("utf-8")).hexdigest()
+
+
+class ArticleStore:
+    def __init__(self, db_path: str = "article_store.db"):
+        """
+        A SQLite store of per-article derived fields, keyed by canonical URL.
+
+        Each entry keeps the hash of the search metadata (title + snippet), the
+        hash of the extracted body, the fingerprint of the pipeline that tagged
+        it and when the page was last fetched, so the collector can tell whether
+        an article has to be re-fetched, re-extracted or re-tagged.
+        """
+        self.db_path = db_path
+        with self._connect() as conn:
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(articles)")}
+            # The store is only a cache, so a table from an older layout is rebuilt.
+            if columns and columns != COLUMNS:
+                conn.execute("DROP TABLE articles")
+            conn.execute(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        # Commits (or rolls back) and then closes the connection on exit.
+        with closing(conn), conn:
+            yield conn
+
+    def get_many(self, urls: list) -> dict:
+        """Returns {canonical_url: entry} for the URLs that are already stored."""
+        if not urls:
+            return {}
+        placeholders = ",".join("?" * len(urls))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM articles WHERE url IN ({placeholders})", list(urls)
+            ).fetchall()
+        return {row["url"]: dict(row, record=json.loads(row["record"])) for row in rows}
+
+    def put_many(self, entries: list):
+        """Upserts entries given as (canonical_url, meta_hash, body_hash, fingerprint, fetched_at, record) tuples."""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO articles (url, meta_hash, body_hash, fingerprint, fetched_at, record) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(url, meta_hash, body_hash, fingerprint, fetched_at, json.dumps(record))
+                 for url, meta_hash, body_hash, fingerprint, fetched_at, record in entries],
+            )
+
+    def prune(self, max_age_seconds: float):
+        """Deletes entries whose page has not been fetched within `max_age_seconds`."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM articles WHERE fetched_at < ?", (time.time() - max_age_seconds,))
@@ -1,16 +1,34 @@
 import os
+import json
+import time
 import asyncio
 import httpx
 import pandas as pd
 import trafilatura
 from dotenv import load_dotenv
-from dateutil import parser as dateparser
 import spacy
-from msa_mapping import extract_msa_region
+from datetime import datetime, timezone
+from msa_mapping import extract_msa_region, city_to_msa
+from date_normalizer import normalize_dates
+from nlp_processor import match_themes
+from article_store import ArticleStore, canonical_url, content_hash
 from sklearn.feature_extraction.text import TfidfVectorizer
 
 load_dotenv()
 
+# --- Incremental Pipeline Settings ---
+# Bump when the logic of extract_msa_region or extract_keywords changes.
+# Edits to the MSA gazetteer are picked up automatically.
+PIPELINE_VERSION = 1
+PIPELINE_FINGERPRINT = content_hash(
+    str(PIPELINE_VERSION),
+    json.dumps(city_to_msa, sort_keys=True),
+)
+# Stored pages older than this are fetched again even if their headline is unchanged.
+ARTICLE_REFETCH_SECONDS = 6 * 3600
+# Entries not fetched for this long are dropped from the store.
+ARTICLE_RETENTION_SECONDS = 14 * 86400
+
 class MarketIntelligenceCollector:
     def __init__(self):
         self.serper_api_key = os.getenv("SERPER_API_KEY")
@@ -22,6 +40,8 @@ class MarketIntelligenceCollector:
         except OSError:
             spacy.cli.download("en_core_web_sm")
             self.nlp = spacy.load("en_core_web_sm")
+        # Derived fields of already-processed articles, so repeat results skip the pipeline.
+        self.article_store = ArticleStore(os.getenv("ARTICLE_STORE_DB", "article_store.db"))
 
     def search_web_and_extract(self, query: str, search_type: str = "news", num_results: int = 15, date_filter: str = None) -> pd.DataFrame:
         if not self.serper_api_key:
@@ -43,6 +63,9 @@ class MarketIntelligenceCollector:
             payload["tbs"] = date_filter_map[date_filter]
         # --- END OF FIX ---
 
+        # All relative dates ("3 hours ago") in this batch share one reference time.
+        reference_time = datetime.now(timezone.utc)
+
         try:
             async with httpx.AsyncClient(timeout=20) as client:
                 resp = await client.post(endpoint, headers=self.serper_headers, json=payload)
@@ -52,40 +75,84 @@ class MarketIntelligenceCollector:
                 print(f"No results found for query: '{query}'")
                 return pd.DataFrame()
 
-            urls = [r["link"] for r in results]
+            # --- Incremental Processing ---
+            # Recently fetched articles with unchanged search metadata are reused without
+            # fetching; the rest are fetched. Tags are only recomputed when the extracted
+            # body changed or were produced by a different pipeline fingerprint.
+            now = time.time()
+            keys = [canonical_url(r["link"]) for r in results]
+            meta_hashes = [content_hash(r.get("title", ""), r.get("snippet", "")) for r in results]
+            stored = self.article_store.get_many(keys)
+
+            to_fetch = [
+                i for i, (key, meta_hash) in enumerate(zip(keys, meta_hashes))
+                if key not in stored or stored[key]["meta_hash"] != meta_hash
+                or now - stored[key]["fetched_at"] > ARTICLE_REFETCH_SECONDS
+            ]
             async with httpx.AsyncClient(timeout=25, follow_redirects=True) as client:
-                tasks = [client.get(u) for u in urls]
-                responses = await asyncio.gather(*tasks, return_exceptions=True)
-
-            articles = []
-            for meta, response in zip(results, responses):
-                if isinstance(response, Exception) or not hasattr(response, 'text') or not response.text:
-                    continue
-                body = trafilatura.extract(response.text, include_comments=False, include_formatting=False)
-                if not body:
-                    continue
-
-                date_iso = ""
-                try:
-                    date_str = meta.get("date", "")
-                    if date_str:
-                        date_iso = dateparser.parse(date_str, fuzzy=True).strftime("%Y-%m-%d")
-                except Exception:
-                    date_iso = ""
-
-                articles.append({
+                tasks = [client.get(results[i]["link"]) for i in to_fetch]
+                responses = dict(zip(to_fetch, await asyncio.gather(*tasks, return_exceptions=True)))
+
+            articles, store_keys, needs_tagging = [], [], []
+            for i, meta in enumerate(results):
+                key = keys[i]
+                if i in responses:
+                    response = responses[i]
+                    if isinstance(response, Exception) or not hasattr(response, 'text') or not response.text:
+                        continue
+                    body = trafilatura.extract(response.text, include_comments=False, include_formatting=False)
+                    if not body:
+                        continue
+                    body_hash, fetched_at = content_hash(body), now
+                    unchanged = key in stored and stored[key]["body_hash"] == body_hash
+                else:
+                    body, body_hash, fetched_at = stored[key]["record"]["summary"], stored[key]["body_hash"], stored[key]["fetched_at"]
+                    unchanged = True
+
+                article = {
                     "title": meta.get("title", "No Title"), "link": meta.get("link", ""),
-                    "published": date_iso, "summary": body,
+                    # Dates always come from the fresh metadata, since relative dates drift.
+                    "raw_date": meta.get("date", ""), "summary": body,
                     "source": meta.get("source", meta.get("link", "").split("/")[2]),
                     "category": "web_search"
-                })
+                }
+                if unchanged and stored[key]["fingerprint"] == PIPELINE_FINGERPRINT:
+                    record = stored[key]["record"]
+                    article.update(msa=record["msa"], keywords=record["keywords"])
+                else:
+                    needs_tagging.append(len(articles))
+                articles.append(article)
+                store_keys.append((key, meta_hashes[i], body_hash, fetched_at))
             
             if not articles:
                 return pd.DataFrame()
 
             df = pd.DataFrame(articles)
-            df["msa"] = df["summary"].fillna("").str[:5000].apply(extract_msa_region)
-            df['keywords'] = df['summary'].apply(lambda text: self.extract_keywords(text))
+            for column in ["msa", "keywords"]:
+                if column not in df.columns:
+                    df[column] = None
+            # Dates are normalized for the whole batch at once; `published_at` is typed
+            # for filtering/sorting, while `published` keeps the display string.
+            df["published_at"] = normalize_dates(df.pop("raw_date"), reference_time)
+            df["published"] = df["published_at"].dt.strftime("%Y-%m-%d").fillna("")
+
+            # NER and keyword stages only run for new or changed articles.
+            if needs_tagging:
+                new = df.loc[needs_tagging]
+                df.loc[needs_tagging, "msa"] = new["summary"].fillna("").str[:5000].apply(extract_msa_region)
+                df.loc[needs_tagging, "keywords"] = new["summary"].apply(lambda text: self.extract_keywords(text))
+
+            # Theme hits depend on the current title as well as the body, and the
+            # precompiled match is cheap, so they are recomputed for every article.
+            df["theme_hits"] = (df["title"].fillna("") + " " + df["summary"].fillna("")).apply(match_themes)
+
+            self.article_store.put_many([
+                (key, meta_hash, body_hash, PIPELINE_FINGERPRINT, fetched_at,
+                 {"summary": row["summary"], "msa": row["msa"], "keywords": row["keywords"]})
+                for (key, meta_hash, body_hash, fetched_at), (_, row) in zip(store_keys, df.iterrows())
+            ])
+            self.article_store.prune(ARTICLE_RETENTION_SECONDS)
+            print(f"Processed {len(needs_tagging)} new or changed articles; reused {len(df) - len(needs_tagging)}.")
             return df
         except Exception as e:
             print(f"❌ An error occurred during web search: {e}")
@@ -0,0 +1,124 @@
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+
+import pandas as pd
+
+# --- Relative Date Patterns ---
+# Serper mostly returns dates like "3 hours ago" or "2 days ago". These are
+# resolved against a single reference time so that every row in a batch is
+# measured from the same instant.
+RELATIVE_PATTERN = re.compile(
+    r"^\s*(?P<amount>\d+|an?|one)\s+(?P<unit>sec|second|min|minute|hour|hr|day|week|wk|month|mo|year|yr)s?\s+ago\s*$",
+    re.IGNORECASE,
+)
+
+UNIT_TO_DELTA = {
+    "sec": timedelta(seconds=1), "second": timedelta(seconds=1),
+    "min": timedelta(minutes=1), "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1), "hr": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1), "wk": timedelta(weeks=1),
+    # Months and years are approximated; Serper only reports them for old articles.
+    "month": timedelta(days=30), "mo": timedelta(days=30),
+    "year": timedelta(days=365), "yr": timedelta(days=365),
+}
+
+NAMED_OFFSETS = {
+    "just now": timedelta(0),
+    "now": timedelta(0),
+    "today": timedelta(0),
+    "yesterday": timedelta(days=1),
+}
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """Drops timezone info after converting to UTC so all timestamps are comparable."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _parse_relative(date_str: str):
+    """Returns the offset described by a relative expression, or None."""
+    key = date_str.strip().lower()
+    if key in NAMED_OFFSETS:
+        return NAMED_OFFSETS[key]
+
+    match = RELATIVE_PATTERN.match(key)
+    if not match:
+        return None
+
+    amount = match.group("amount")
+    amount = 1 if amount in {"a", "an", "one"} else int(amount)
+    return amount * UNIT_TO_DELTA[match.group("unit")]
+
+
+@lru_cache(maxsize=4096)
+def _parse_absolute(date_str: str):
+    """Parses ISO-8601 and RFC-822 dates, returning a naive UTC datetime or None."""
+    value = date_str.strip()
+
+    # ISO-8601 (e.g., "2024-05-01" or "2024-05-01T12:30:00Z").
+    try:
+        return _to_naive_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    except ValueError:
+        pass
+
+    # RFC-822 (e.g., "Wed, 01 May 2024 12:30:00 GMT"), common in feeds.
+    try:
+        return _to_naive_utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def normalize_dates(date_strings, reference_time: datetime = None) -> pd.Series:
+    """
+    Converts a batch of raw date strings into typed timestamps.
+
+    Each string is first tried against the fast paths (relative expressions,
+    ISO-8601 and RFC-822), all of which are memoized. Whatever remains is
+    handed to a single vectorized `pd.to_datetime` call instead of being
+    fuzzily parsed row by row.
+
+    Args:
+        date_strings: An iterable of raw date strings (empty or None allowed).
+        reference_time: The instant relative expressions are measured from.
+            Defaults to the current UTC time.
+
+    Returns:
+        A `datetime64` Series (naive UTC) with NaT for unparseable values.
+    """
+    if reference_time is None:
+        reference_time = datetime.now(timezone.utc)
+    reference_time = _to_naive_utc(reference_time)
+
+    raw = pd.Series(list(date_strings), dtype="object")
+    parsed = [None] * len(raw)
+    unresolved = []
+
+    for i, date_str in enumerate(raw):
+        if not isinstance(date_str, str) or not date_str.strip():
+            continue
+
+        offset = _parse_relative(date_str)
+        if offset is not None:
+            parsed[i] = reference_time - offset
+            continue
+
+        absolute = _parse_absolute(date_str)
+        if absolute is not None:
+            parsed[i] = absolute
+        else:
+            unresolved.append(i)
+
+    result = pd.to_datetime(pd.Series(parsed, index=raw.index, dtype="object"), errors="coerce")
+
+    # --- Vectorized Fallback ---
+    if unresolved:
+        fallback = pd.to_datetime(raw.iloc[unresolved], errors="coerce", utc=True, format="mixed")
+        result.iloc[unresolved] = fallback.dt.tz_localize(None)
+
+    return result
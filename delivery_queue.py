@@ -0,0 +1,230 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager
+
+# --- Job States ---
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS delivery_jobs (
+    id TEXT PRIMARY KEY,
+    idempotency_key TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    result TEXT,
+    error TEXT,
+    owner TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class DeliveryQueue:
+    def __init__(self, db_path: str = "delivery_queue.db", max_attempts: int = 5, backoff_seconds: float = 2.0,
+                 lease_seconds: float = 300.0):
+        """
+        A durable, SQLite-backed queue of delivery jobs (Google Docs, emails).
+
+        Args:
+            db_path: Path to the SQLite database file.
+            max_attempts: How many times a job is tried before it is marked failed.
+            backoff_seconds: Base delay for exponential backoff between retries.
+            lease_seconds: How long a claimed job may stay 'running' before it is
+                assumed abandoned by a dead worker and handed out again.
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.lease_seconds = lease_seconds
+        with self._connect() as conn:
+            conn.execute(SCHEMA)
+            # Databases created before leases were added lack the owner column.
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(delivery_jobs)")}
+            if "owner" not in columns:
+                conn.execute("ALTER TABLE delivery_jobs ADD COLUMN owner TEXT")
+
+    @contextmanager
+    def _connect(self):
+        # A fresh connection per call keeps the queue safe to use from the
+        # Streamlit script thread and the worker thread at the same time. The
+        # transaction is committed (or rolled back) and the connection closed on exit.
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        with closing(conn), conn:
+            yield conn
+
+    def enqueue(self, kind: str, payload: dict, idempotency_key: str = None) -> str:
+        """
+        Adds a job to the queue and returns its id.
+
+        If a job with the same idempotency key already exists, no new job is
+        created and the existing job's id is returned instead. A job with that
+        key that has already failed for good is reset so it is tried again.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO delivery_jobs "
+                "(id, idempotency_key, kind, payload, status, max_attempts, next_attempt_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, idempotency_key or job_id, kind, json.dumps(payload), PENDING, self.max_attempts, now, now, now),
+            )
+            conn.execute(
+                "UPDATE delivery_jobs SET status = ?, attempts = 0, next_attempt_at = ?, error = NULL, owner = NULL, "
+                "payload = ?, updated_at = ? WHERE idempotency_key = ? AND status = ?",
+                (PENDING, now, json.dumps(payload), now, idempotency_key or job_id, FAILED),
+            )
+            row = conn.execute(
+                "SELECT id FROM delivery_jobs WHERE idempotency_key = ?", (idempotency_key or job_id,)
+            ).fetchone()
+        return row["id"]
+
+    def enqueue_emails(self, content: str, subject: str, recipients: list, idempotency_key: str) -> list:
+        """Queues one email job per recipient, all sharing a batch idempotency key prefix."""
+        return [
+            self.enqueue("email", {"content": content, "subject": subject, "recipient": recipient},
+                         idempotency_key=f"{idempotency_key}:{recipient.lower()}")
+            for recipient in recipients
+        ]
+
+    def get_status(self, job_id: str) -> dict:
+        """Returns the job's current state for the UI to poll, or None if unknown."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, kind, status, attempts, result, error FROM delivery_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def claim_due_jobs(self, owner: str, limit: int = 10) -> list:
+        """Atomically marks up to `limit` due jobs as running under `owner` and returns them."""
+        with self._connect() as conn:
+            # BEGIN IMMEDIATE takes the write lock up front so two workers never claim the same job.
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT * FROM delivery_jobs WHERE status = ? AND next_attempt_at <= ? "
+                "ORDER BY created_at LIMIT ?",
+                (PENDING, time.time(), limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE delivery_jobs SET status = ?, owner = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(RUNNING, owner, time.time(), row["id"]) for row in rows],
+            )
+        return [dict(row, owner=owner, payload=json.loads(row["payload"]), attempts=row["attempts"] + 1) for row in rows]
+
+    def mark_completed(self, job: dict, result: str):
+        # Scoped to the owner, so a worker whose lease expired cannot overwrite the new owner's state.
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE delivery_jobs SET status = ?, result = ?, error = NULL, updated_at = ? WHERE id = ? AND owner = ?",
+                (COMPLETED, result, time.time(), job["id"], job["owner"]),
+            )
+
+    def mark_failed(self, job: dict, error: str):
+        """Schedules a retry with exponential backoff, or fails the job for good."""
+        if job["attempts"] >= job["max_attempts"]:
+            status, next_attempt_at = FAILED, job["next_attempt_at"]
+        else:
+            status = PENDING
+            next_attempt_at = time.time() + self.backoff_seconds * (2 ** (job["attempts"] - 1))
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE delivery_jobs SET status = ?, error = ?, next_attempt_at = ?, updated_at = ? WHERE id = ? AND owner = ?",
+                (status, error, next_attempt_at, time.time(), job["id"], job["owner"]),
+            )
+
+    def requeue_stale_jobs(self):
+        """Returns jobs whose lease expired (their worker died) to the pending state."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE delivery_jobs SET status = ?, owner = NULL, updated_at = ? WHERE status = ? AND updated_at < ?",
+                (PENDING, now, RUNNING, now - self.lease_seconds),
+            )
+
+
+class DeliveryWorker(threading.Thread):
+    def __init__(self, queue: DeliveryQueue, handlers: dict, poll_interval: float = 1.0, batch_size: int = 10):
+        """
+        Background thread that executes queued delivery jobs.
+
+        Args:
+            queue: The DeliveryQueue to pull jobs from.
+            handlers: Maps a job kind (e.g., "email") to a callable that takes the
+                job payload, returns a result string, and raises on failure.
+            poll_interval: Seconds to sleep when no jobs are due.
+            batch_size: Maximum number of jobs claimed per poll.
+        """
+        super().__init__(daemon=True)
+        # Identifies this worker's claims, so leases from other workers are left alone.
+        self.owner = uuid.uuid4().hex
+        self.queue = queue
+        self.handlers = handlers
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self._stop_event = threading.Event()
+
+    def run_once(self) -> int:
+        """Executes one batch of due jobs and returns how many were processed."""
+        jobs = self.queue.claim_due_jobs(self.owner, self.batch_size)
+        for job in jobs:
+            handler = self.handlers.get(job["kind"])
+            if handler is None:
+                self.queue.mark_failed(dict(job, attempts=job["max_attempts"]), f"No handler for job kind '{job['kind']}'.")
+                continue
+            try:
+                result = handler(job["payload"])
+            except Exception as e:
+                print(f"ERROR: Delivery job {job['id']} ({job['kind']}) failed on attempt {job['attempts']}: {e}")
+                self.queue.mark_failed(job, str(e))
+                continue
+            # Outside the except: once the handler has delivered, a bookkeeping error
+            # must not schedule a retry that would deliver a second time.
+            self.queue.mark_completed(job, result)
+        return len(jobs)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.queue.requeue_stale_jobs()
+                if self.run_once():
+                    continue
+            except Exception as e:
+                # Keep the worker alive through transient errors (e.g., a locked database);
+                # nothing restarts it while the queue stays cached.
+                print(f"ERROR: Delivery worker loop failed: {e}")
+            self._stop_event.wait(self.poll_interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+# --- One Worker per Process ---
+# Streamlit re-runs cached initializers after "Clear cache", so the active worker
+# is tracked here and replaced rather than left running alongside a new one.
+_worker_lock = threading.Lock()
+_active_worker = None
+
+
+def start_worker(queue: DeliveryQueue, handlers: dict, **kwargs) -> DeliveryWorker:
+    """Stops any previously started worker in this process and starts a new one."""
+    global _active_worker
+    with _worker_lock:
+        if _active_worker is not None:
+            # The old worker finishes its current batch and then exits; its
+            # in-flight jobs keep their lease, so the new worker won't rerun them.
+            _active_worker.stop()
+        _active_worker = DeliveryWorker(queue, handlers, **kwargs)
+        _active_worker.start()
+        return _active_worker
@@ -0,0 +1,126 @@
+import re
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Splits on sentence-ending punctuation followed by whitespace and a capital/quote/digit.
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+# Titles and abbreviations common in policy news that end in a period mid-sentence.
+ABBREVIATIONS = {
+    "sen.", "rep.", "gov.", "dept.", "dr.", "mr.", "mrs.", "ms.", "prof.", "gen.", "lt.", "col.",
+    "st.", "inc.", "corp.", "co.", "ltd.", "jr.", "sr.", "no.", "vs.", "assn.", "univ.", "admin.",
+    "jan.", "feb.", "mar.", "apr.", "aug.", "sept.", "sep.", "oct.", "nov.", "dec.",
+}
+# Dotted initialisms ("U.S.", "D.C.") and single initials ("J.").
+INITIALISM = re.compile(r"^(?:[A-Za-z]\.)+$")
+
+
+class ExtractiveSummarizer:
+    def __init__(self, num_bullets: int = 4, diversity: float = 0.3, max_overlap: float = 0.7, max_sentences: int = 300):
+        """
+        Initializes the local extractive summarizer.
+
+        Args:
+            num_bullets: Number of sentences to select for the briefing.
+            diversity: MMR trade-off; 0 ranks purely by centrality, higher
+                values penalize sentences similar to ones already selected.
+            max_overlap: Cosine similarity above which a sentence is treated as
+                a near-duplicate of one already selected and skipped.
+            max_sentences: Cap on candidate sentences, keeping latency bounded.
+        """
+        self.num_bullets = num_bullets
+        self.diversity = diversity
+        self.max_overlap = max_overlap
+        self.max_sentences = max_sentences
+
+    @staticmethod
+    def segment(text: str) -> list:
+        """Splits text into sentences without breaking after abbreviations like "U.S." or "Sen."."""
+        sentences = []
+        for piece in SENTENCE_SPLIT.split(text):
+            if sentences:
+                last_token = sentences[-1].rsplit(" ", 1)[-1]
+                if last_token.lower() in ABBREVIATIONS or INITIALISM.match(last_token):
+                    sentences[-1] = f"{sentences[-1]} {piece}"
+                    continue
+            sentences.append(piece)
+        return sentences
+
+    def split_sentences(self, articles_df: pd.DataFrame) -> list:
+        """Segments article titles and bodies into clean candidate sentences."""
+        sentences, seen = [], set()
+        for _, row in articles_df.iterrows():
+            text = f"{row.get('title', '')}. {row.get('summary', '')}" if isinstance(row.get('summary'), str) else str(row.get('title', ''))
+            for sentence in self.segment(re.sub(r"\s+", " ", text)):
+                sentence = sentence.strip()
+                # Skip fragments and run-ons, which make poor bullet points.
+                if not 8 <= len(sentence.split()) <= 60:
+                    continue
+                key = sentence.lower()
+                if key in seen:
+                    continue
+                seen.add(key)
+                sentences.append(sentence)
+                if len(sentences) >= self.max_sentences:
+                    return sentences
+        return sentences
+
+    def _textrank(self, similarity: np.ndarray, damping: float = 0.85, iterations: int = 30) -> np.ndarray:
+        """Scores sentence centrality with PageRank over the similarity graph."""
+        graph = similarity.copy()
+        np.fill_diagonal(graph, 0.0)
+        row_sums = graph.sum(axis=1, keepdims=True)
+        # Isolated sentences link uniformly so the transition matrix stays stochastic.
+        graph = np.divide(graph, row_sums, out=np.full_like(graph, 1.0 / len(graph)), where=row_sums > 0)
+
+        scores = np.full(len(graph), 1.0 / len(graph))
+        for _ in range(iterations):
+            scores = (1 - damping) / len(graph) + damping * graph.T @ scores
+        return scores
+
+    def _mmr_select(self, scores: np.ndarray, similarity: np.ndarray) -> list:
+        """Picks central sentences while penalizing redundancy (Maximal Marginal Relevance)."""
+        relevance = scores / scores.max()
+        selected = [int(np.argmax(relevance))]
+        while len(selected) < min(self.num_bullets, len(scores)):
+            redundancy = similarity[:, selected].max(axis=1)
+            mmr = (1 - self.diversity) * relevance - self.diversity * redundancy
+            mmr[selected] = -np.inf
+            # Syndicated articles repeat the same sentences; never pick a near-duplicate.
+            mmr[redundancy > self.max_overlap] = -np.inf
+            if not np.isfinite(mmr).any():
+                break
+            selected.append(int(np.argmax(mmr)))
+        return selected
+
+    def summarize(self, articles_df: pd.DataFrame) -> list:
+        """
+        Selects the most representative sentences across all articles.
+
+        Args:
+            articles_df: DataFrame with 'title' and 'summary' columns.
+
+        Returns:
+            A list of up to `num_bullets` sentences, most central first.
+        """
+        if articles_df.empty:
+            return []
+
+        sentences = self.split_sentences(articles_df)
+        if len(sentences) <= 1:
+            return sentences
+
+        try:
+            vectors = TfidfVectorizer(stop_words='english', sublinear_tf=True).fit_transform(sentences)
+        except ValueError:
+            # Every sentence was made up of stop words.
+            return sentences[:self.num_bullets]
+
+        # TF-IDF rows are L2-normalized, so the dot product is cosine similarity.
+        similarity = (vectors @ vectors.T).toarray()
+        selected = self._mmr_select(self._textrank(similarity), similarity)
+        return [sentences[i] for i in selected]
+
+    def summarize_as_bullets(self, articles_df: pd.DataFrame) -> str:
+        """Formats the selected sentences as a Markdown bullet list."""
+        return "\n".join(f"- {sentence}" for sentence in self.summarize(articles_df))
@@ -1,6 +1,7 @@
 import os
 from openai import OpenAI, APIError
 from dotenv import load_dotenv
+from extractive_summarizer import ExtractiveSummarizer
 
 load_dotenv()
 
@@ -13,6 +14,21 @@ class NewsletterGenerator:
             self.client = None
         else:
             self.client = OpenAI(api_key=api_key)
+        # Local summarizer used for instant briefings and when the LLM is unavailable.
+        self.extractive_summarizer = ExtractiveSummarizer()
+
+    def generate_extractive_briefing(self, articles_df):
+        """
+        Builds a 3-4 bullet briefing locally using TextRank + MMR sentence selection.
+        Runs in milliseconds on CPU, so it can be rendered while the LLM call is pending.
+        """
+        if articles_df.empty:
+            return "No articles found for this theme."
+        bullets = self.extractive_summarizer.summarize_as_bullets(articles_df)
+        if bullets:
+            return bullets
+        # No usable sentences (e.g., very short extracts); list the titles instead.
+        return "\n".join(f"- {title}" for title in articles_df['title'].head(3))
 
     def generate_newsletter_section(self, articles_df, theme_keywords):
         """
@@ -74,6 +90,12 @@ class NewsletterGenerator:
             return "No articles found for this theme."
         
         summary = f"This analysis covers {len(articles_df)} articles related to '{theme_keywords[0]}'.\n"
+        bullets = self.extractive_summarizer.summarize_as_bullets(articles_df)
+        if bullets:
+            summary += "Key developments:\n"
+            return summary + bullets
+
+        # No usable sentences (e.g., very short extracts); list the titles instead.
         summary += "Key developments appear in the following articles:\n"
         
         for _, article in articles_df.head(3).iterrows():
@@ -0,0 +1,315 @@
+"""
+Headless load test for the Streamlit dashboard's rerun path.
+
+Drives `app.py` through Streamlit's AppTest (theme select -> Search -> Add to
+Report -> Generate) against stubbed collector, LLM and Arcade backends, so only
+the dashboard's own work is measured. For each result-set size it records:
+
+- Per-rerun wall time for N concurrent sessions (p50/p95 per step).
+- Session-state memory retained by each concurrent session.
+- cProfile hot spots and tracemalloc memory for one isolated session.
+
+Usage:
+    python load_test.py --sessions 8 --sizes 10 50 200 --save-baseline baseline.json
+    python load_test.py --sessions 8 --sizes 10 50 200 --baseline baseline.json
+
+With --baseline, the exit code is 1 if any step's p95, the per-session memory or the
+isolated peak memory regressed beyond --tolerance.
+"""
+import argparse
+import cProfile
+import io
+import json
+import os
+import pickle
+import re
+import pstats
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+# Private Streamlit internals, patched below and restored afterwards. Checked against
+# streamlit 1.66.0; re-verify both after upgrading (requirements.txt doesn't pin it).
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+THEME = "Federal Policy"
+STEPS = ["initial", "select_theme", "search", "add_to_report", "generate"]
+
+# Sentences are built from the theme keywords so articles land in several themes.
+ARTICLE_SENTENCES = [
+    "The CHIPS Act directs new federal research grants to university semiconductor labs in Texas.",
+    "Lawmakers said the federal AI legislation would expand research funding for HBCUs and colleges.",
+    "Officials expect the Tech Hub designation in Pittsburgh to have a lasting economic impact.",
+    "The NSF Recompete Pilot Program will announce its next round of awards later this year.",
+    "University leaders reported record research expenditures tied to semiconductors.",
+]
+
+
+# --- Stubbed Backends ---
+def make_articles(num_articles: int) -> pd.DataFrame:
+    """Builds a synthetic result set shaped like `search_web_and_extract` output."""
+    rows = []
+    for i in range(num_articles):
+        body = " ".join(ARTICLE_SENTENCES[(i + j) % len(ARTICLE_SENTENCES)] for j in range(8))
+        rows.append({
+            "title": f"Federal R&D update #{i}: CHIPS Act and university research",
+            "link": f"https://example.gov/articles/{i}",
+            "published_at": pd.Timestamp("2024-05-01") + pd.Timedelta(hours=i),
+            "published": "2024-05-01",
+            "summary": f"{body} Article {i} adds detail on grant {i}.",
+            "source": "example.gov",
+            "category": "web_search",
+            "msa": "Uncategorized",
+            "keywords": ["chips", "research", "university"],
+        })
+    return pd.DataFrame(rows)
+
+
+def install_stub_backends(num_articles: int, llm_latency: float):
+    """Replaces the network-bound modules imported by app.py with local stand-ins."""
+    from extractive_summarizer import ExtractiveSummarizer
+
+    class StubCollector:
+        def search_web_and_extract(self, query, search_type="news", num_results=15, date_filter=None):
+            return make_articles(num_articles)
+
+    class StubGenerator:
+        def __init__(self):
+            # A truthy client makes the app render the extractive briefing first.
+            self.client = object()
+            self.extractive_summarizer = ExtractiveSummarizer()
+
+        def generate_extractive_briefing(self, articles_df):
+            return self.extractive_summarizer.summarize_as_bullets(articles_df)
+
+        def generate_newsletter_section(self, articles_df, theme_keywords):
+            time.sleep(llm_latency)
+            return "- Stubbed LLM briefing point one.\n- Stubbed LLM briefing point two."
+
+    data_collection = types.ModuleType("data_collection")
+    data_collection.MarketIntelligenceCollector = StubCollector
+    llm_generator = types.ModuleType("llm_generator")
+    llm_generator.NewsletterGenerator = StubGenerator
+    tools = types.ModuleType("tools")
+    tools.build_delivery_handlers = lambda: {
+        "google_doc": lambda payload: f"Success! The Google Doc '{payload['file_name']}' has been created.",
+        "email": lambda payload: f"Success! The email has been sent to {payload['recipient']}.",
+    }
+    sys.modules.update({"data_collection": data_collection, "llm_generator": llm_generator, "tools": tools})
+
+
+@contextmanager
+def share_script_cache():
+    """
+    Makes every AppTest session reuse one compiled copy of app.py.
+
+    A real Streamlit server shares a single ScriptCache across sessions, whereas
+    each AppTest builds its own; sharing it also avoids compiling the script
+    concurrently from several threads.
+    """
+    shared_cache = ScriptCache()
+    original_get_bytecode = ScriptCache.get_bytecode
+    ScriptCache.get_bytecode = lambda self, script_path: original_get_bytecode(shared_cache, script_path)
+    try:
+        yield
+    finally:
+        ScriptCache.get_bytecode = original_get_bytecode
+
+
+# --- Session Driver ---
+def session_state_bytes(at: AppTest) -> int:
+    """Approximates the memory a session retains between reruns (its session state)."""
+    total = 0
+    for key in at.session_state.keys():
+        value = at.session_state[key]
+        if isinstance(value, pd.DataFrame):
+            total += int(value.memory_usage(deep=True).sum())
+        else:
+            try:
+                total += len(pickle.dumps(value))
+            except Exception:
+                total += sys.getsizeof(value)
+    return total
+
+
+def find_button(elements, label: str = None, key: str = None):
+    for button in elements:
+        if (label and button.label == label) or (key and button.key == key):
+            return button
+    raise LookupError(f"Button not found (label={label!r}, key={key!r}).")
+
+
+def run_session(timeout: float) -> tuple:
+    """Runs one full dashboard scenario; returns wall time (seconds) per step and session-state bytes."""
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    actions = {
+        "initial": lambda: at,
+        "select_theme": lambda: at.sidebar.selectbox[0].select(THEME),
+        "search": lambda: find_button(at.sidebar.button, label="Search").click(),
+        "add_to_report": lambda: next(b for b in at.button if b.key and b.key.startswith("add_")).click(),
+        "generate": lambda: find_button(at.sidebar.button, label="Generate Single Report").click(),
+    }
+
+    timings = {}
+    for step in STEPS:
+        widget = actions[step]()
+        start = time.perf_counter()
+        widget.run()
+        timings[step] = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"App raised during step '{step}': {at.exception[0].message}")
+    return timings, session_state_bytes(at)
+
+
+def profile_isolated_session(timeout: float, top_n: int) -> dict:
+    """Runs one session alone under cProfile and tracemalloc."""
+    profiler = cProfile.Profile()
+    original_thread = LocalScriptRunner._run_script_thread
+
+    # app.py executes on the runner's own thread, so the profiler is enabled there.
+    def profiled_thread(runner):
+        profiler.enable()
+        try:
+            original_thread(runner)
+        finally:
+            profiler.disable()
+
+    LocalScriptRunner._run_script_thread = profiled_thread
+    tracemalloc.start()
+    try:
+        timings, _ = run_session(timeout)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        LocalScriptRunner._run_script_thread = original_thread
+
+    # Self time surfaces the real hot spots; cumulative time is dominated by Streamlit's
+    # runner wrappers, so it is only shown for the repo's own modules.
+    repo_dir = os.path.dirname(APP_PATH)
+    stream = io.StringIO()
+    stream.write(f"--- Top {top_n} functions by self time ---\n")
+    pstats.Stats(profiler, stream=stream).sort_stats("tottime").print_stats(top_n)
+    stream.write(f"--- Top {top_n} repo functions by cumulative time ---\n")
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(re.escape(repo_dir), top_n)
+    return {
+        "timings": timings,
+        "memory_current_mb": current / 1e6,
+        "memory_peak_mb": peak / 1e6,
+        "hot_spots": stream.getvalue(),
+    }
+
+
+def run_concurrent_sessions(num_sessions: int, timeout: float) -> dict:
+    """Runs N sessions in parallel threads and summarizes per-step wall times and per-session memory."""
+    with ThreadPoolExecutor(max_workers=num_sessions) as pool:
+        results = list(pool.map(lambda _: run_session(timeout), range(num_sessions)))
+
+    summary = {}
+    for step in STEPS:
+        summary[step] = summarize_samples([timings[step] for timings, _ in results])
+    summary["session_memory_mb"] = summarize_samples([state_bytes / 1e6 for _, state_bytes in results])
+    return summary
+
+
+def summarize_samples(samples: list) -> dict:
+    samples = sorted(samples)
+    return {
+        "p50": statistics.median(samples),
+        "p95": samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))],
+        "max": samples[-1],
+    }
+
+
+# --- Regression Check ---
+def find_regressions(report: dict, baseline: dict, tolerance: float) -> list:
+    """Lists wall-time and memory metrics that exceed the baseline by more than `tolerance`."""
+    regressions = []
+    for size, result in report.items():
+        base_result = baseline.get(size, {})
+        for metric, stats in result["concurrent"].items():
+            base = base_result.get("concurrent", {}).get(metric)
+            unit = "MB" if metric == "session_memory_mb" else "s"
+            if base and stats["p95"] > base["p95"] * (1 + tolerance):
+                regressions.append(f"size={size} {metric}: p95 {stats['p95']:.3f}{unit} vs baseline {base['p95']:.3f}{unit}")
+
+        peak, base_peak = result["isolated"]["memory_peak_mb"], base_result.get("isolated", {}).get("memory_peak_mb")
+        if base_peak and peak > base_peak * (1 + tolerance):
+            regressions.append(f"size={size} isolated peak memory: {peak:.1f}MB vs baseline {base_peak:.1f}MB")
+    return regressions
+
+
+def run_load_test(args) -> dict:
+    """Runs the isolated and concurrent phases for every result-set size and prints a summary."""
+    report = {}
+    for size in args.sizes:
+        install_stub_backends(size, args.llm_latency)
+        # Stubs are captured by st.cache_resource, so clear it when the size changes.
+        import streamlit as st
+        st.cache_resource.clear()
+        st.cache_data.clear()
+
+        isolated = profile_isolated_session(args.timeout, args.top)
+        concurrent = run_concurrent_sessions(args.sessions, args.timeout)
+        report[str(size)] = {
+            "isolated": {k: v for k, v in isolated.items() if k != "hot_spots"},
+            "concurrent": concurrent,
+        }
+
+        print(f"\n=== {size} articles, {args.sessions} concurrent sessions ===")
+        print(f"Isolated session memory: current {isolated['memory_current_mb']:.1f} MB, peak {isolated['memory_peak_mb']:.1f} MB")
+        memory = concurrent["session_memory_mb"]
+        print(f"Per-session state memory: p50 {memory['p50']:.2f} MB  p95 {memory['p95']:.2f} MB  max {memory['max']:.2f} MB")
+        for step in STEPS:
+            stats = concurrent[step]
+            print(f"  {step:<14} isolated {isolated['timings'][step]:.3f}s | "
+                  f"p50 {stats['p50']:.3f}s  p95 {stats['p95']:.3f}s  max {stats['max']:.3f}s")
+        print(isolated["hot_spots"])
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the dashboard's rerun path.")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent sessions per result-set size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200], help="Result-set sizes to test.")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated LLM latency in seconds.")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-rerun AppTest timeout in seconds.")
+    parser.add_argument("--top", type=int, default=15, help="Number of cProfile entries to print.")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against.")
+    parser.add_argument("--save-baseline", help="Write this run's results as a baseline JSON.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95/memory growth vs baseline (0.25 = 25%%).")
+    args = parser.parse_args()
+
+    # Keep queued deliveries out of the real queue database.
+    os.environ["DELIVERY_QUEUE_DB"] = os.path.join(tempfile.mkdtemp(), "delivery_queue.db")
+    # app.py reads keywords.csv relative to the working directory.
+    os.chdir(os.path.dirname(APP_PATH))
+    with share_script_cache():
+        report = run_load_test(args)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(report, json.load(f), args.tolerance)
+        if regressions:
+            print("❌ Rerun regressions detected:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("✅ No rerun regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import re
 import pandas as pd
 import spacy
 from rapidfuzz import process
@@ -23,13 +24,69 @@ except FileNotFoundError:
     all_cities = []
 
 
+# --- Gazetteer Pre-screen ---
+# Most articles never mention a known place, so a single regex pass over the
+# gazetteer (city names, aliases like "NYC", and the state codes in each MSA
+# name) decides whether spaCy needs to run at all.
+def build_gazetteer_pattern(cities: list, msa_names: list):
+    """Compiles one alternation over all gazetteer terms, longest first."""
+    state_codes = {code for msa in msa_names for code in re.findall(r"\b[A-Z]{2}\b", msa.split(",")[-1])}
+    terms = sorted(set(cities) | state_codes, key=len, reverse=True)
+    if not terms:
+        return None
+    # Matching is case-sensitive: place names are proper nouns, and this keeps
+    # words like "spring" or "aurora" from triggering NER.
+    return re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\b")
+
+
+gazetteer_pattern = build_gazetteer_pattern(all_cities, list(city_to_msa.values()))
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+# Number of neighbouring sentences kept on each side of a gazetteer hit.
+WINDOW_SENTENCES = 1
+
+
+def find_candidate_windows(text: str) -> str:
+    """
+    Returns only the sentences around gazetteer hits, or "" if there are none.
+
+    Args:
+        text: The input text (e.g., an article summary).
+
+    Returns:
+        The hit sentences (plus neighbours) joined in their original order.
+    """
+    if gazetteer_pattern is None:
+        return ""
+
+    hits = [m.start() for m in gazetteer_pattern.finditer(text)]
+    if not hits:
+        return ""
+
+    # Sentence start offsets, used to locate the sentence containing each hit.
+    starts = [0] + [m.end() for m in SENTENCE_BOUNDARY.finditer(text)]
+    sentences = [text[start:end].strip() for start, end in zip(starts, starts[1:] + [len(text)])]
+
+    keep = set()
+    sentence_idx = 0
+    for hit in hits:
+        while sentence_idx + 1 < len(starts) and starts[sentence_idx + 1] <= hit:
+            sentence_idx += 1
+        lo = max(0, sentence_idx - WINDOW_SENTENCES)
+        hi = min(len(sentences) - 1, sentence_idx + WINDOW_SENTENCES)
+        keep.update(range(lo, hi + 1))
+
+    return " ".join(sentences[i] for i in sorted(keep))
+
+
 def extract_msa_region(text: str) -> str:
     """
     Extracts a U.S. Metropolitan Statistical Area (MSA) from text.
 
     This function uses spaCy for Named Entity Recognition (NER) to find
     geopolitical entities (GPEs) and then uses fuzzy matching to map them
-    to a known list of U.S. cities and their corresponding MSAs.
+    to a known list of U.S. cities and their corresponding MSAs. Texts with
+    no gazetteer hits skip NER entirely, and the rest are reduced to the
+    sentences around those hits before being parsed.
 
     Args:
         text: The input text (e.g., an article summary).
@@ -40,7 +97,11 @@ def extract_msa_region(text: str) -> str:
     if not all_cities or not isinstance(text, str):
         return "Uncategorized"
 
-    doc = nlp(text)
+    candidate_text = find_candidate_windows(text)
+    if not candidate_text:
+        return "Uncategorized"
+
+    doc = nlp(candidate_text)
 
     for ent in doc.ents:
         # We only care about geopolitical entities.
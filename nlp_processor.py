@@ -19,6 +19,26 @@ THEME_DEFINITIONS = {
     ]
 }
 
+# Compiled once: one word-bounded alternation per theme.
+THEME_PATTERNS = {
+    theme_name: re.compile(r'\b(?:' + '|'.join(re.escape(kw.lower()) for kw in theme_keywords) + r')\b')
+    for theme_name, theme_keywords in THEME_DEFINITIONS.items()
+}
+
+
+def match_themes(text: str) -> list:
+    """
+    Returns the names of the themes whose keywords appear in the text.
+
+    The result only depends on the article text, so the collector computes it
+    once per article and stores it in the `theme_hits` column.
+    """
+    if not isinstance(text, str):
+        return []
+    text = text.lower()
+    return [theme_name for theme_name, pattern in THEME_PATTERNS.items() if pattern.search(text)]
+
+
 class MarketIntelligenceNLP:
     def __init__(self):
         """
@@ -71,11 +91,15 @@ class MarketIntelligenceNLP:
             return pd.DataFrame(), {}
 
         # --- Step 2: Assign filtered articles to specific themes ---
+        # Reuse the theme hits stored by the collector; only derive them when missing.
+        if 'theme_hits' not in relevant_articles_df.columns:
+            relevant_articles_df['theme_hits'] = relevant_articles_df['text_for_search'].apply(match_themes)
+
         themes_with_articles = {}
         for theme_name, theme_keywords in THEME_DEFINITIONS.items():
             # Find articles that match the keywords for this specific theme.
             matching_articles = relevant_articles_df[
-                relevant_articles_df['text_for_search'].apply(lambda x: contains_any_keyword(x, theme_keywords))
+                relevant_articles_df['theme_hits'].apply(lambda hits: theme_name in hits)
             ]
 
             if not matching_articles.empty:
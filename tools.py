@@ -9,6 +9,46 @@ ARCADE_API_KEY = os.getenv("ARCADE_API_KEY")
 USER_ID = os.getenv("ARCADE_USER_ID")
 client = Arcade(api_key=ARCADE_API_KEY)
 
+# --- Delivery Helpers ---
+# These raise on failure so the delivery worker can retry them; the tool
+# functions below wrap them for direct, synchronous use.
+def create_document(content: str, file_name: str, arcade_client=client) -> str:
+    """Creates a Google Doc via Arcade and returns a success message, raising on failure."""
+    if not USER_ID:
+        raise RuntimeError("ARCADE_USER_ID is not set in the .env file.")
+    result = arcade_client.tools.execute(
+        tool_name="GoogleDocs.CreateDocumentFromText@4.0.0",
+        input={"title": file_name, "text_content": content},
+        user_id=USER_ID,
+    )
+    if not result or result.status != "completed":
+        raise RuntimeError(f"Google Doc creation did not complete. Response: {result}")
+    return f"Success! The Google Doc '{file_name}' has been created."
+
+
+def deliver_email(content: str, subject: str, recipient: str, arcade_client=client) -> str:
+    """Sends an email via Arcade and returns a success message, raising on failure."""
+    if not USER_ID:
+        raise RuntimeError("ARCADE_USER_ID is not set in the .env file.")
+    result = arcade_client.tools.execute(
+        tool_name="Gmail.SendEmail@3.0.0",
+        input={"body": content, "subject": subject, "recipient": recipient},
+        user_id=USER_ID,
+    )
+    # Access the results via the .value attribute
+    if result and result.status == "completed" and result.value and result.value.get("status") == "success":
+        return f"Success! The email has been sent to {recipient}."
+    raise RuntimeError(f"An unknown error occurred while sending the email. Response: {result.value if result else result}")
+
+
+def build_delivery_handlers(arcade_client=client) -> dict:
+    """Maps delivery job kinds to their executors for `DeliveryWorker`."""
+    return {
+        "google_doc": lambda payload: create_document(payload["content"], payload["file_name"], arcade_client),
+        "email": lambda payload: deliver_email(payload["content"], payload["subject"], payload["recipient"], arcade_client),
+    }
+
+
 # --- Tool 1: Google Docs ---
 def add_content_to_document(content: str, file_name: str = "R&D Intelligence Report"):
     """
@@ -18,25 +58,7 @@ def add_content_to_document(content: str, file_name: str = "R&D Intelligence Rep
         return "Error: ARCADE_USER_ID is not set in the .env file."
     print(f"TOOL CALLED: Creating Google Doc titled '{file_name}'...")
     try:
-        result = client.tools.execute(
-            tool_name="GoogleDocs.CreateDocumentFromText@4.0.0",
-            input={"title": file_name, "text_content": content},
-            user_id=USER_ID,
-        )
-
-        # --- NEW DEBUGGING CODE ---
-        # This will print the exact structure of the response object to your terminal
-        print("\n--- DEBUGGING ARCADE RESPONSE ---")
-        print(f"Type of result object: {type(result)}")
-        print(f"Result object itself: {result}")
-        print(f"Available attributes: {dir(result)}")
-        print("--- END DEBUGGING ---\n")
-        # --- END OF DEBUGGING CODE ---
-
-        # The old logic is temporarily bypassed to allow us to see the debug info
-        # We will fix this in the next step based on the debug output
-        return "Debugging complete. Please check your terminal output."
-
+        return create_document(content, file_name)
     except Exception as e:
         print(f"ERROR: Arcade tool execution failed: {e}")
         return "Failed to create the Google Document due to an error."
@@ -52,20 +74,9 @@ def send_email(content: str, subject: str, recipient: str):
         return "Error: ARCADE_USER_ID is not set in the .env file."
     print(f"TOOL CALLED: Sending email to {recipient} with subject '{subject}'...")
     try:
-        result = client.tools.execute(
-            tool_name="Gmail.SendEmail@3.0.0",
-            input={"body": content, "subject": subject, "recipient": recipient},
-            user_id=USER_ID,
-        )
-        
-        # --- CORRECTED PART ---
-        # Access the results via the .value attribute
-        if result and result.status == "completed" and result.value and result.value.get("status") == "success":
-            print(f"Successfully sent email to {recipient}")
-            return f"Success! The email has been sent to {recipient}."
-        else:
-            return f"An unknown error occurred while sending the email. Response: {result.value}"
-
+        response = deliver_email(content, subject, recipient)
+        print(f"Successfully sent email to {recipient}")
+        return response
     except Exception as e:
         print(f"ERROR: Arcade tool execution failed: {e}")
         return f"Failed to send the email due to an error: {e}"